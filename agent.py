@@ -11,10 +11,12 @@ Simplified Architecture:
 No separate triage agent needed - root does it directly!
 """
 
-from pathlib import Path
 from google.adk.agents import Agent, SequentialAgent
+from google.genai import types
+from numismatch.app_utils.prompts import load_prompt
 from numismatch.app_utils.typing import TriageResponse
 from numismatch.pipeline_agents import (
+    no_thinking_planner,
     coin_identifier,
     price_researcher,
     validator_agent,
@@ -22,13 +24,6 @@ from numismatch.pipeline_agents import (
 )
 
 
-def load_prompt(filename: str) -> str:
-    """Load prompt from the prompts folder."""
-    prompt_path = Path(__file__).parent / "prompts" / filename
-    with open(prompt_path, "r") as f:
-        return f.read()
-
-
 # Roman Coin Pipeline (SequentialAgent)
 # Steps 1-4: Full analysis pipeline (only runs if root confirms Roman)
 roman_coin_pipeline = SequentialAgent(
@@ -41,7 +36,7 @@ roman_coin_pipeline = SequentialAgent(
     sub_agents=[
         coin_identifier,    # Step 1: Identify + catalog search
         price_researcher,   # Step 2: Historical price research
-        validator_agent,    # Step 3: Validate and clean data
+        validator_agent,    # Step 3: Validate and clean price data
         summarizer_agent,   # Step 4: Generate final report
     ],
 )
@@ -60,6 +55,12 @@ root_agent = Agent(
     ),
     instruction=load_prompt("0_root_agent_prompt.txt"),
     output_schema=TriageResponse,  # Ensures guaranteed JSON structure when NOT delegating
+    planner=no_thinking_planner,  # Triage is a quick yes/no check, no reasoning needed
+    # TriageResponse is ~50 tokens; response_schema is set by ADK from output_schema
+    generate_content_config=types.GenerateContentConfig(
+        max_output_tokens=128,
+        temperature=0.0,
+    ),
     sub_agents=[
         roman_coin_pipeline,  # Delegates here if Roman coin detected
     ],
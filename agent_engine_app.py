@@ -13,11 +13,16 @@
 # limitations under the License.
 
 # mypy: disable-error-code="attr-defined,arg-type"
+import asyncio
+import io
 import logging
 import os
-from typing import Any
+import re
+from functools import cached_property
+from typing import Any, AsyncIterator, Iterator
 
 import google.auth
+import google.auth.credentials
 import vertexai
 from google.adk.artifacts import GcsArtifactService, InMemoryArtifactService
 from google.cloud import logging as google_cloud_logging
@@ -26,16 +31,89 @@ from opentelemetry.sdk.trace import TracerProvider, export
 from vertexai.agent_engines.templates.adk import AdkApp
 
 from numismatch.agent import root_agent
+from numismatch.app_utils.http import submit_io
 from numismatch.app_utils.tracing import CloudTraceLoggingSpanExporter
-from numismatch.app_utils.typing import Feedback
+from numismatch.app_utils.typing import FEEDBACK_ADAPTER, TriageResponse
+
+# Feedback is written to Cloud Logging in batches, off the request path
+FEEDBACK_FLUSH_INTERVAL_SECONDS = 0.1
+FEEDBACK_QUEUE_MAXSIZE = 1000
+
+# Cheap non-LLM pre-triage for messages that cannot contain coin data
+_TRIVIAL_MESSAGE_PATTERN = re.compile(
+    r"(hi|hello|hey|test|ping)[\s!.?]*", re.IGNORECASE
+)
+PRE_TRIAGE_RESPONSE = TriageResponse(
+    is_roman=False,
+    response="Please provide a coin image or description.",
+    is_finished=True,
+).model_dump_json()
+
+
+def _is_trivial_message(message: Any) -> bool:
+    """
+    Return True for empty or greeting-only messages without image/file parts.
+
+    Anything that is not a str or a Content dict of dict parts is left to the agent.
+    """
+    if isinstance(message, str):
+        text = message
+    elif isinstance(message, dict):
+        parts = message.get("parts")
+        if not isinstance(parts, list) or not all(isinstance(part, dict) for part in parts):
+            return False
+        for part in parts:
+            if any(key in part for key in ("inline_data", "inlineData", "file_data", "fileData")):
+                return False
+        texts = [part.get("text") or "" for part in parts]
+        if not all(isinstance(text, str) for text in texts):
+            return False
+        text = "".join(texts)
+    else:
+        return False
+    text = text.strip()
+    return not text or _TRIVIAL_MESSAGE_PATTERN.fullmatch(text) is not None
+
+
+def _event_texts(event: Any) -> Iterator[str]:
+    """Yield the text parts of a streamed event (JSON dict or typed ADK Event)."""
+    try:
+        parts = event["content"]["parts"]
+    except (KeyError, TypeError):
+        # Typed Event objects (or events without content)
+        parts = getattr(getattr(event, "content", None), "parts", None)
+    for part in parts or ():
+        try:
+            text = part["text"]
+        except KeyError:
+            continue
+        except TypeError:
+            text = getattr(part, "text", None)
+        if text:
+            yield text
+
 
 class AgentEngineApp(AdkApp):
     def set_up(self) -> None:
-        """Set up logging and tracing for the agent engine app."""
+        """Set up logging and (optionally) tracing for the agent engine app."""
         super().set_up()
         logging.basicConfig(level=logging.INFO)
-        logging_client = google_cloud_logging.Client()
-        self.logger = logging_client.logger(__name__)
+        # Cloud Trace export is opt-in to keep it off the cold-start path
+        if os.environ.get("ENABLE_TRACING") == "1":
+            trace.set_tracer_provider(self.tracer_provider)
+
+    @cached_property
+    def logger(self) -> google_cloud_logging.Logger:
+        """Cloud Logging logger, created on first use (e.g. first feedback)."""
+        credentials, project_id = _default_credentials()
+        logging_client = google_cloud_logging.Client(
+            project=project_id, credentials=credentials
+        )
+        return logging_client.logger(__name__)
+
+    @cached_property
+    def tracer_provider(self) -> TracerProvider:
+        """Tracer provider exporting spans to Cloud Trace, created on first use."""
         provider = TracerProvider()
         processor = export.BatchSpanProcessor(
             CloudTraceLoggingSpanExporter(
@@ -43,7 +121,7 @@ class AgentEngineApp(AdkApp):
             )
         )
         provider.add_span_processor(processor)
-        trace.set_tracer_provider(provider)
+        return provider
 
     async def query(
         self,
@@ -59,6 +137,30 @@ class AgentEngineApp(AdkApp):
         Note: Vertex AI Agent Engine REST API spreads the 'input' dict as kwargs,
         so message, user_id, session_id come in as separate parameters.
         """
+        buf = io.StringIO()
+        async for chunk in self.query_stream(
+            message=message,
+            user_id=user_id,
+            session_id=session_id,
+            **kwargs
+        ):
+            buf.write(chunk["delta"])
+        
+        # Return response with just output (session_id not available here)
+        response = {"output": buf.getvalue() or "No response generated"}
+        return response
+
+    async def query_stream(
+        self,
+        message: str | dict[str, Any],
+        user_id: str | None = None,
+        session_id: str | None = None,
+        **kwargs
+    ) -> AsyncIterator[dict[str, str]]:
+        """
+        Streaming variant of query that yields {"delta": text} per text chunk.
+        This method is exposed as a streaming REST endpoint for external clients.
+        """
         # If message is a dict with user_id/session_id keys (legacy format), extract them
         # Otherwise, message is already the Content dict (role, parts) from the REST API
         if isinstance(message, dict) and ("user_id" in message or "session_id" in message):
@@ -76,50 +178,118 @@ class AgentEngineApp(AdkApp):
             session_id,
         )
         
-        # Call parent's async_stream_query (which handles sessions automatically)
-        full_text = ""
+        # Empty or greeting-only messages without images never need the LLM triage
+        if _is_trivial_message(message):
+            logging.info("Pre-triage: trivial message, skipping agent run")
+            yield {"delta": PRE_TRIAGE_RESPONSE}
+            return
         
+        # Call parent's async_stream_query (which handles sessions automatically)
         async for event in self.async_stream_query(
             message=message,
             user_id=user_id,
             session_id=session_id,
             **kwargs
         ):
-            # Extract text from event
-            if isinstance(event, dict) and "content" in event:
-                content = event["content"]
-                if isinstance(content, dict) and "parts" in content:
-                    for part in content["parts"]:
-                        if isinstance(part, dict) and "text" in part:
-                            full_text += part["text"]
-        
-        # Return response with just output (session_id not available here)
-        response = {"output": full_text or "No response generated"}
-        return response
+            for text in _event_texts(event):
+                yield {"delta": text}
 
     def register_feedback(self, feedback: dict[str, Any]) -> None:
-        """Collect and log feedback."""
-        feedback_obj = Feedback.model_validate(feedback)
-        self.logger.log_struct(feedback_obj.model_dump(), severity="INFO")
+        """Collect feedback and queue it for batched logging."""
+        feedback_obj = FEEDBACK_ADAPTER.validate_python(feedback)
+        # The writer runs on the shared I/O loop, which outlives every request;
+        # only wait until the entry is queued, not until it is logged
+        submit_io(self._enqueue_feedback(feedback_obj.model_dump())).result()
+
+    async def _enqueue_feedback(self, entry: dict[str, Any]) -> None:
+        """Put a feedback entry on the queue (runs on the shared I/O loop)."""
+        await self._feedback_queue().put(entry)
+
+    def _feedback_queue(self) -> asyncio.Queue[dict[str, Any]]:
+        """Return the feedback queue, starting its writer task on first use."""
+        writer = getattr(self, "_feedback_writer", None)
+        if writer is None or writer.done():
+            self._feedback_entries: asyncio.Queue[dict[str, Any]] = asyncio.Queue(
+                maxsize=FEEDBACK_QUEUE_MAXSIZE
+            )
+            self._feedback_writer = asyncio.create_task(
+                self._write_feedback(self._feedback_entries)
+            )
+        return self._feedback_entries
+
+    async def _write_feedback(self, queue: asyncio.Queue[dict[str, Any]]) -> None:
+        """Drain the feedback queue into one Cloud Logging batch per flush interval."""
+        entries: list[dict[str, Any]] = []
+        try:
+            while True:
+                entries.append(await queue.get())
+                await asyncio.sleep(FEEDBACK_FLUSH_INTERVAL_SECONDS)
+                while not queue.empty():
+                    entries.append(queue.get_nowait())
+                # Handed to the worker thread, which finishes even if we are cancelled
+                batch, entries = entries, []
+                try:
+                    await asyncio.to_thread(self._log_feedback_batch, batch)
+                except Exception:
+                    logging.exception("Failed to log %d feedback entries", len(batch))
+        finally:
+            # On cancellation (process shutdown) flush everything still pending
+            while not queue.empty():
+                entries.append(queue.get_nowait())
+            if entries:
+                try:
+                    self._log_feedback_batch(entries)
+                except Exception:
+                    logging.exception("Failed to log %d feedback entries", len(entries))
+
+    def _log_feedback_batch(self, entries: list[dict[str, Any]]) -> None:
+        """Write feedback entries to Cloud Logging in a single request."""
+        with self.logger.batch() as batch:
+            for entry in entries:
+                batch.log_struct(entry, severity="INFO")
 
     def register_operations(self) -> dict[str, list[str]]:
         """Register custom operations for Agent Engine."""
         operations = super().register_operations()
-        # Register our minimal query wrapper and feedback as custom operations
+        # Register our minimal query wrappers and feedback as custom operations
         operations["async"] = operations.get("async", []) + ["query"]
+        operations["async_stream"] = operations.get("async_stream", []) + ["query_stream"]
         operations[""] = operations.get("", []) + ["register_feedback"]
         return operations
 
 
 
-_, project_id = google.auth.default()
-vertexai.init(project=project_id, location="us-central1")
-artifacts_bucket_name = os.environ.get("ARTIFACTS_BUCKET_NAME")
-agent_engine = AgentEngineApp(
-    agent=root_agent,
-    artifact_service_builder=lambda: GcsArtifactService(
-        bucket_name=artifacts_bucket_name
+# google.auth.default() result, resolved on first use
+_CREDS_CACHE: tuple[google.auth.credentials.Credentials, str | None] | None = None
+
+
+def _default_credentials() -> tuple[google.auth.credentials.Credentials, str | None]:
+    """Return the default credentials and project, resolving them only once."""
+    global _CREDS_CACHE
+    if _CREDS_CACHE is None:
+        _CREDS_CACHE = google.auth.default()
+    return _CREDS_CACHE
+
+
+def _build_app() -> AgentEngineApp:
+    """Initialize Vertex AI and build the Agent Engine app."""
+    _, project_id = _default_credentials()
+    vertexai.init(project=project_id, location="us-central1")
+    artifacts_bucket_name = os.environ.get("ARTIFACTS_BUCKET_NAME")
+    return AgentEngineApp(
+        agent=root_agent,
+        artifact_service_builder=lambda: GcsArtifactService(
+            bucket_name=artifacts_bucket_name
+        )
+        if artifacts_bucket_name
+        else InMemoryArtifactService(),
     )
-    if artifacts_bucket_name
-    else InMemoryArtifactService(),
-)
+
+
+def __getattr__(name: str) -> Any:
+    """Build agent_engine on first access so importing this module stays cheap."""
+    if name == "agent_engine":
+        global agent_engine
+        agent_engine = _build_app()
+        return agent_engine
+    raise AttributeError(f"module {__name__!r} has no attribute {name!r}")
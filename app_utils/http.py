@@ -0,0 +1,106 @@
+# Copyright 2025 Google LLC
+#
+# Licensed under the Apache License, Version 2.0 (the "License");
+# you may not use this file except in compliance with the License.
+# You may obtain a copy of the License at
+#
+#     http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS,
+# WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+# See the License for the specific language governing permissions and
+# limitations under the License.
+"""
+Shared HTTP I/O for external tool calls.
+
+AdkApp's sync stream_query runs every call through asyncio.run on a new thread,
+so requests arrive on many short-lived event loops. Pooled connections and
+asyncio primitives are bound to one loop, so all external tool I/O runs on a
+single long-lived background loop instead: tools hand their coroutines to
+run_io() (or submit_io() from sync code) and send requests through
+get_shared_async_client(), so connections (DNS, TLS, HTTP/2) are reused
+across calls, tools and requests. The loop and its client are shut down when
+the process exits.
+"""
+import asyncio
+import atexit
+import concurrent.futures
+import logging
+import threading
+from typing import Any, Coroutine, TypeVar
+
+import httpx
+
+T = TypeVar("T")
+
+# Seconds to wait for pending tool I/O (e.g. feedback flushes) at process exit
+IO_SHUTDOWN_TIMEOUT_SECONDS = 10.0
+
+_io_loop: asyncio.AbstractEventLoop | None = None
+_io_loop_lock = threading.Lock()
+
+# Only touched from the I/O loop thread
+_shared_async_client: httpx.AsyncClient | None = None
+
+
+def _get_io_loop() -> asyncio.AbstractEventLoop:
+    """Return the shared I/O loop, starting its thread on first use."""
+    global _io_loop
+    with _io_loop_lock:
+        if _io_loop is None:
+            loop = asyncio.new_event_loop()
+            threading.Thread(
+                target=loop.run_forever, name="numismatch-io", daemon=True
+            ).start()
+            atexit.register(_shutdown_io_loop, loop)
+            _io_loop = loop
+    return _io_loop
+
+
+def submit_io(coro: Coroutine[Any, Any, T]) -> concurrent.futures.Future[T]:
+    """Schedule a coroutine on the shared I/O loop from synchronous code."""
+    return asyncio.run_coroutine_threadsafe(coro, _get_io_loop())
+
+
+async def run_io(coro: Coroutine[Any, Any, T]) -> T:
+    """Run a coroutine on the shared I/O loop and await its result."""
+    loop = _get_io_loop()
+    if asyncio.get_running_loop() is loop:
+        return await coro
+    # Cancelling the caller cancels the coroutine on the I/O loop as well
+    return await asyncio.wrap_future(asyncio.run_coroutine_threadsafe(coro, loop))
+
+
+def get_shared_async_client() -> httpx.AsyncClient:
+    """Return the shared HTTP/2 client; must be called on the I/O loop."""
+    global _shared_async_client
+    if _shared_async_client is None or _shared_async_client.is_closed:
+        # Per-request timeouts are left to the callers (e.g. the OpenAI SDK)
+        _shared_async_client = httpx.AsyncClient(
+            http2=True,
+            limits=httpx.Limits(max_connections=64, max_keepalive_connections=32),
+        )
+    return _shared_async_client
+
+
+async def _close_io() -> None:
+    """Cancel pending tool I/O, let it clean up, then close the shared client."""
+    tasks = [task for task in asyncio.all_tasks() if task is not asyncio.current_task()]
+    for task in tasks:
+        task.cancel()
+    await asyncio.gather(*tasks, return_exceptions=True)
+    if _shared_async_client is not None:
+        await _shared_async_client.aclose()
+
+
+def _shutdown_io_loop(loop: asyncio.AbstractEventLoop) -> None:
+    """Close the shared client and stop the I/O loop at process exit."""
+    try:
+        asyncio.run_coroutine_threadsafe(_close_io(), loop).result(
+            timeout=IO_SHUTDOWN_TIMEOUT_SECONDS
+        )
+    except Exception:
+        logging.exception("Failed to shut down the tool I/O loop cleanly")
+    finally:
+        loop.call_soon_threadsafe(loop.stop)
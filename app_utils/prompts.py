@@ -0,0 +1,31 @@
+"""
+Prompt loading for Numismatch agents.
+
+All prompt files are read once at import; agents look them up from memory.
+"""
+
+import os
+from pathlib import Path
+
+PROMPTS_DIR = Path(__file__).resolve().parent.parent / "prompts"
+
+
+def _read_prompts(directory: Path) -> dict[str, str]:
+    """Read every .txt prompt in the directory in a single scandir pass."""
+    with os.scandir(directory) as entries:
+        return {
+            entry.name: Path(entry.path).read_text(encoding="utf-8")
+            for entry in entries
+            if entry.is_file() and entry.name.endswith(".txt")
+        }
+
+
+_PROMPTS = _read_prompts(PROMPTS_DIR)
+
+
+def load_prompt(filename: str) -> str:
+    """Load prompt from the prompts folder."""
+    prompt = _PROMPTS.get(filename)
+    if prompt is None:
+        prompt = (PROMPTS_DIR / filename).read_text(encoding="utf-8")
+    return prompt
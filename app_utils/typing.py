@@ -11,13 +11,17 @@
 # WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
 # See the License for the specific language governing permissions and
 # limitations under the License.
+import copy
 from typing import (
+    Any,
     Literal,
 )
 
 from pydantic import (
     BaseModel,
+    ConfigDict,
     Field,
+    TypeAdapter,
 )
 
 
@@ -32,7 +36,33 @@ class Feedback(BaseModel):
     user_id: str = ""
 
 
-class TriageResponse(BaseModel):
+# Built once at import; feedback arrives from external clients and must stay validated
+FEEDBACK_ADAPTER = TypeAdapter(Feedback)
+
+
+# (model class, schema arguments) -> generated JSON schema
+_JSON_SCHEMA_CACHE: dict[tuple[Any, ...], dict[str, Any]] = {}
+
+
+class CachedSchemaModel(BaseModel):
+    """
+    Base for agent output schemas whose JSON schema is generated only once.
+
+    The genai SDK calls model_json_schema() on the output_schema class for
+    every Gemini request and mutates the result, so callers get a deep copy
+    of the cached schema.
+    """
+
+    @classmethod
+    def model_json_schema(cls, *args: Any, **kwargs: Any) -> dict[str, Any]:
+        key = (cls, args, tuple(sorted(kwargs.items())))
+        schema = _JSON_SCHEMA_CACHE.get(key)
+        if schema is None:
+            schema = _JSON_SCHEMA_CACHE[key] = super().model_json_schema(*args, **kwargs)
+        return copy.deepcopy(schema)
+
+
+class TriageResponse(CachedSchemaModel):
     """
     Structured response from the root triage agent when NOT delegating to pipeline.
     
@@ -55,8 +85,19 @@ class TriageResponse(BaseModel):
     )
 
 
+# Report models are built once per sale row / report and never mutated afterwards
+REPORT_MODEL_CONFIG = ConfigDict(
+    extra="ignore",
+    frozen=True,
+    str_strip_whitespace=True,
+    validate_assignment=False,
+)
+
+
 class Inscriptions(BaseModel):
     """Coin inscriptions on obverse and reverse."""
+
+    model_config = REPORT_MODEL_CONFIG
     
     obverse: str = Field(
         description="Inscription on the obverse (front) of the coin. "
@@ -70,6 +111,8 @@ class Inscriptions(BaseModel):
 
 class CatalogNumber(BaseModel):
     """Catalog reference for the coin."""
+
+    model_config = REPORT_MODEL_CONFIG
     
     catalog_type: str = Field(
         description="Type of catalog (e.g., RIC, RSC, Sear, Cohen, BMCRE)"
@@ -84,6 +127,8 @@ class CatalogNumber(BaseModel):
 
 class HistoricalSale(BaseModel):
     """Individual historical sale record."""
+
+    model_config = REPORT_MODEL_CONFIG
     
     no: int = Field(
         description="Sale number/index in the list (1, 2, 3, etc.)"
@@ -113,6 +158,8 @@ class HistoricalSale(BaseModel):
 
 class CoinDetails(BaseModel):
     """Detailed information about the identified coin."""
+
+    model_config = REPORT_MODEL_CONFIG
     
     emperor: str = Field(
         description="Name of the emperor or ruler (e.g., 'Augustus', 'Trajan', 'Hadrian')"
@@ -140,6 +187,8 @@ class CoinDetails(BaseModel):
 
 class MarketStatistics(BaseModel):
     """Market analysis statistics."""
+
+    model_config = REPORT_MODEL_CONFIG
     
     total_sales: int = Field(
         description="Total number of historical sales found"
@@ -156,6 +205,8 @@ class MarketStatistics(BaseModel):
 
 class IdentificationSummary(BaseModel):
     """Summary of the identification process and confidence."""
+
+    model_config = REPORT_MODEL_CONFIG
     
     overall_confidence: str = Field(
         description="Confidence level (e.g., 'High', 'Medium', 'Low', 'Very High')"
@@ -179,13 +230,15 @@ class IdentificationSummary(BaseModel):
     )
 
 
-class CoinIdentificationReport(BaseModel):
+class CoinIdentificationReport(CachedSchemaModel):
     """
     Complete structured report for Roman coin identification and pricing.
     
     This schema ensures guaranteed JSON output from the summarizer agent
     with all identification, catalog, and historical sales data.
     """
+
+    model_config = REPORT_MODEL_CONFIG
     
     is_finished: bool = Field(
         default=True,
@@ -205,3 +258,8 @@ class CoinIdentificationReport(BaseModel):
     identification_summary: IdentificationSummary = Field(
         description="Summary of identification confidence and any issues"
     )
+
+
+# Warm the schema cache at import so the first Gemini request does not pay for it
+TriageResponse.model_json_schema()
+CoinIdentificationReport.model_json_schema()
@@ -11,19 +11,23 @@ Pipeline steps:
 4. Summarizer - Generates final structured JSON report
 """
 
-from pathlib import Path
 from google.adk.agents.llm_agent import Agent
+from google.adk.planners import BuiltInPlanner
 from google.adk.tools.google_search_tool import GoogleSearchTool
+from google.genai import types
+from numismatch.app_utils.prompts import load_prompt
 from numismatch.app_utils.typing import CoinIdentificationReport
-from numismatch.tools import perplexity_search
+from numismatch.tools import perplexity_search, perplexity_search_batch
 
 
-def load_prompt(filename: str) -> str:
-    """Load prompt from the prompts directory."""
-    prompt_path = Path(__file__).parent / "prompts" / filename
-    with open(prompt_path, "r") as f:
-        return f.read()
+# Thinking disabled for agents that only follow a tight output format.
+# The coin identifier and the price researcher keep their reasoning budget.
+no_thinking_planner = BuiltInPlanner(
+    thinking_config=types.ThinkingConfig(thinking_budget=0),
+)
 
+# Single Google Search tool instance shared by all searching agents
+_SEARCH_TOOL = GoogleSearchTool(bypass_multi_tools_limit=True)
 
 # Step 1: Coin Identifier (Heavy Model with Search)
 coin_identifier = Agent(
@@ -41,7 +45,11 @@ price_researcher = Agent(
     description='Searches for historical sales data using Perplexity AI for comprehensive price research',
     instruction=load_prompt("2_price_researcher_prompt.txt"),
     output_key='price_data',
-    tools=[perplexity_search, GoogleSearchTool(bypass_multi_tools_limit=True)],
+    tools=[
+        perplexity_search,
+        perplexity_search_batch,
+        _SEARCH_TOOL,
+    ],
 )
 
 # Step 3: Validator (Fast Model with Search)
@@ -51,7 +59,11 @@ validator_agent = Agent(
     description='Validates catalog numbers and price data, removes duplicates and inconsistencies',
     instruction=load_prompt("3_validator_prompt.txt"),
     output_key='validated_results',
-    tools=[GoogleSearchTool(bypass_multi_tools_limit=True)],
+    planner=no_thinking_planner,
+    generate_content_config=types.GenerateContentConfig(
+        max_output_tokens=8192,  # Echoes every price item (~100 tokens each) back
+    ),
+    tools=[_SEARCH_TOOL],
 )
 
 # Step 4: Summarizer (Final Report Generator)
@@ -61,6 +73,10 @@ summarizer_agent = Agent(
     description='Creates comprehensive final structured JSON report with all identification and pricing data',
     instruction=load_prompt("4_summarizer_prompt.txt"),
     output_key='final_report',
+    planner=no_thinking_planner,
+    generate_content_config=types.GenerateContentConfig(
+        max_output_tokens=8192,  # Up to ~50 sales rows in the final report
+    ),
     output_schema=CoinIdentificationReport,  # Ensures guaranteed JSON structure
     tools=[],
 )
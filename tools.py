@@ -2,11 +2,71 @@
 Custom tools for Numismatch agents.
 """
 
+import asyncio
 import os
-from openai import OpenAI
+import threading
+import time
 
+import httpx
+from openai import AsyncOpenAI
 
-def perplexity_search(query: str) -> str:
+from numismatch.app_utils.http import get_shared_async_client, run_io
+
+
+# Perplexity responses are cached per normalized query for a few hours
+PERPLEXITY_CACHE_TTL_SECONDS = 6 * 60 * 60
+PERPLEXITY_CACHE_MAXSIZE = 2048
+
+# normalized query -> (expiry timestamp, result); only successful results are kept
+_perplexity_cache: dict[str, tuple[float, str]] = {}
+_perplexity_cache_lock = threading.Lock()
+
+# normalized query -> request in flight on the I/O loop, dropped once it finishes
+_perplexity_inflight: dict[str, asyncio.Task[str]] = {}
+
+# Process-wide upper bound on concurrent Perplexity API calls (rate limit)
+PERPLEXITY_MAX_CONCURRENCY = 8
+
+# Created on the I/O loop, which runs every Perplexity call
+_perplexity_semaphore: asyncio.Semaphore | None = None
+
+
+def _get_perplexity_semaphore() -> asyncio.Semaphore:
+    """Return the process-wide Perplexity concurrency limit."""
+    global _perplexity_semaphore
+    if _perplexity_semaphore is None:
+        _perplexity_semaphore = asyncio.Semaphore(PERPLEXITY_MAX_CONCURRENCY)
+    return _perplexity_semaphore
+
+
+def _normalize_query(query: str) -> str:
+    """Normalize a query so trivially different phrasings share a cache entry."""
+    return " ".join(sorted(query.lower().split()))
+
+
+# Perplexity sonar calls with max_tokens=4000 can run for minutes, so the
+# OpenAI SDK's default request timeout is kept on purpose
+PERPLEXITY_TIMEOUT = httpx.Timeout(600.0, connect=5.0)
+
+# API key -> client on the shared HTTP pool; only touched from the I/O loop
+_perplexity_clients: dict[str, AsyncOpenAI] = {}
+
+
+def _get_perplexity_client(api_key: str) -> AsyncOpenAI:
+    """Return the async Perplexity client for an API key."""
+    client = _perplexity_clients.get(api_key)
+    if client is None:
+        # Perplexity uses OpenAI-compatible API
+        client = _perplexity_clients[api_key] = AsyncOpenAI(
+            api_key=api_key,
+            base_url="https://api.perplexity.ai",
+            http_client=get_shared_async_client(),
+            timeout=PERPLEXITY_TIMEOUT,
+        )
+    return client
+
+
+async def perplexity_search(query: str) -> str:
     """
     Search the web using Perplexity AI for Roman coin price information.
     
@@ -20,41 +80,98 @@ def perplexity_search(query: str) -> str:
     Returns:
         Search results from Perplexity including sources and citations
     """
+    # Runs on the shared I/O loop, which owns the HTTP pool and in-flight requests
+    return await run_io(_cached_perplexity_search(query))
+
+
+async def perplexity_search_batch(queries: list[str]) -> list[str]:
+    """
+    Search the web using Perplexity AI for several queries at once.
+    
+    All queries are sent concurrently, so use this tool instead of repeated
+    perplexity_search calls whenever more than one search is needed.
+    
+    Args:
+        queries: The search queries (e.g., ["RIC II.1 123 Vespasian denarius auction sold prices",
+            "Vespasian IVDAEA CAPTA denarius realized prices"])
+    
+    Returns:
+        Search results from Perplexity, one per query in the same order
+    """
+    return list(await asyncio.gather(*(perplexity_search(query) for query in queries)))
+
+
+async def _cached_perplexity_search(query: str) -> str:
+    """Return the cached result for a query, or request it from Perplexity."""
+    key = _normalize_query(query)
+    with _perplexity_cache_lock:
+        entry = _perplexity_cache.get(key)
+    if entry is not None and entry[0] > time.monotonic():
+        return entry[1]
+
+    task = _perplexity_inflight.get(key)
+    if task is None:
+        task = asyncio.create_task(_perplexity_request(query))
+        _perplexity_inflight[key] = task
+        task.add_done_callback(lambda done: _store_perplexity_result(key, done))
+    # Shielded so a cancelled caller does not cancel a request other callers share
+    return await asyncio.shield(task)
+
+
+def _store_perplexity_result(key: str, task: asyncio.Task[str]) -> None:
+    """Cache a finished request's result; errors are not cached so they get retried."""
+    del _perplexity_inflight[key]
+    if task.cancelled() or task.exception() or task.result().startswith("Error"):
+        return
+    now = time.monotonic()
+    with _perplexity_cache_lock:
+        _evict_perplexity_cache(now)
+        _perplexity_cache[key] = (now + PERPLEXITY_CACHE_TTL_SECONDS, task.result())
+
+
+def _evict_perplexity_cache(now: float) -> None:
+    """Drop expired entries, then the oldest ones while the cache is full (lock held)."""
+    for key, (expires_at, _) in list(_perplexity_cache.items()):
+        if expires_at <= now:
+            del _perplexity_cache[key]
+    while len(_perplexity_cache) >= PERPLEXITY_CACHE_MAXSIZE:
+        del _perplexity_cache[next(iter(_perplexity_cache))]
+
+
+async def _perplexity_request(query: str) -> str:
+    """Call the Perplexity API for a single query."""
     api_key = os.getenv("PERPLEXITY_API_KEY")
     if not api_key:
         return "Error: PERPLEXITY_API_KEY environment variable not set. Please configure your API key."
     
     try:
-        # Perplexity uses OpenAI-compatible API
-        client = OpenAI(
-            api_key=api_key,
-            base_url="https://api.perplexity.ai"
-        )
+        client = _get_perplexity_client(api_key)
         
         # Use Perplexity's search-optimized model
-        response = client.chat.completions.create(
-            model="sonar",  # Perplexity's search model
-            messages=[
-                {
-                    "role": "system",
-                    "content": (
-                        "You are a specialized search assistant for Roman coin price research. "
-                        "Find auction results, dealer listings, and historical sales data. "
-                        "Provide your results as a list of objects with the following keys: source, url, coin image-url, date, price, condition, notes. "
-                        "Always include source URLs, price, image URLs and dates when available. "
-                        "Focus on reputable sources like Heritage Auctions, CNG, Roma Numismatics, "
-                        "Stack's Bowers, Gorny & Mosch, NAC."
-                        "Use also sites like Biddr, Numista, vcoins, coinarchives, ma-shops.de, ebay and others"
-                    )
-                },
-                {
-                    "role": "user",
-                    "content": query
-                }
-            ],
-            temperature=0.15,  # Lower temperature for more factual results
-            max_tokens=4000,
-        )
+        async with _get_perplexity_semaphore():
+            response = await client.chat.completions.create(
+                model="sonar",  # Perplexity's search model
+                messages=[
+                    {
+                        "role": "system",
+                        "content": (
+                            "You are a specialized search assistant for Roman coin price research. "
+                            "Find auction results, dealer listings, and historical sales data. "
+                            "Provide your results as a list of objects with the following keys: source, url, coin image-url, date, price, condition, notes. "
+                            "Always include source URLs, price, image URLs and dates when available. "
+                            "Focus on reputable sources like Heritage Auctions, CNG, Roma Numismatics, "
+                            "Stack's Bowers, Gorny & Mosch, NAC."
+                            "Use also sites like Biddr, Numista, vcoins, coinarchives, ma-shops.de, ebay and others"
+                        )
+                    },
+                    {
+                        "role": "user",
+                        "content": query
+                    }
+                ],
+                temperature=0.15,  # Lower temperature for more factual results
+                max_tokens=4000,
+            )
         
         result = response.choices[0].message.content
         